@@ -1,15 +1,218 @@
 import pandas as pd
+import numpy as np
 import os
-import glob
 import re
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+
+# Native (Rust) xlsx parser when available - much faster than openpyxl on plain data sheets
+_READ_ENGINE = 'calamine' if importlib.util.find_spec('python_calamine') else 'openpyxl'
+
+# Filename patterns (compiled once - load_pile runs them for every file found)
+_DATE_RE = re.compile(r'(\d+[.\-]\d+[.\-]\d+)')
+_M2D_RE = re.compile(r'm2d-recu', re.IGNORECASE)
+_M6D_RE = re.compile(r'm6d-dev', re.IGNORECASE)
+
+# Amount decoration stripped without the regex engine (currency symbols, thousands separators, spaces)
+_AMT_TBL = str.maketrans('', '', '$,€£ \t\n\r')
+_AMT_CHARS = '0123456789.-'
+
+
+# Rows converted per batch in _fast_to_excel (bounds the temporary object copy)
+_WRITE_CHUNK_ROWS = 50_000
+
+# Excel's sheet limits - write-only openpyxl sheets don't enforce them, to_excel did
+_EXCEL_MAX_ROWS = 1_048_576
+_EXCEL_MAX_COLS = 16_384
+
+
+def _fast_to_excel(writer, df, sheet_name):
+    """
+    Streams df into a new sheet of a write-only openpyxl ExcelWriter.
+    Skips pandas' per-cell formatter: header row first, then one append per row.
+    Raises ValueError like to_excel when df (plus its header row) doesn't fit on one sheet.
+    """
+    num_rows, num_cols = df.shape
+    if num_rows + 1 > _EXCEL_MAX_ROWS or num_cols > _EXCEL_MAX_COLS:
+        raise ValueError(
+            f"This sheet is too large! Your sheet size is: {num_rows + 1}, {num_cols} "
+            f"Max sheet size is: {_EXCEL_MAX_ROWS}, {_EXCEL_MAX_COLS}"
+        )
+    ws = writer.book.create_sheet(sheet_name)
+    ws.append(tuple(df.columns))
+    for start in range(0, len(df), _WRITE_CHUNK_ROWS):
+        chunk = df.iloc[start:start + _WRITE_CHUNK_ROWS]
+        # openpyxl can't serialize NaN/NA - write them as empty cells like to_excel does
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            ws.append(row)
+
+
+def _list_pile_files(folder_path, keyword):
+    """
+    Returns paths of the .xlsx files in folder_path whose name contains keyword (case-insensitive).
+    One scandir pass - DirEntry already carries the name and file type.
+    A missing folder yields no files (the caller reports the missing data).
+    """
+    try:
+        with os.scandir(folder_path) as it:
+            return [
+                e.path for e in it
+                if e.is_file() and keyword in e.name.lower() and e.name.lower().endswith('.xlsx')
+            ]
+    except FileNotFoundError:
+        return []
+
+
+def _load_one(path):
+    """
+    Reads one input workbook. Module-level so worker processes can pickle it.
+    """
+    # Load as String to protect IDs from scientific notation
+    return pd.read_excel(path, engine=_READ_ENGINE, dtype=str)
+
+
+# Parquet schema metadata key holding the source workbook's "<st_mtime_ns>:<st_size>"
+_CACHE_STAMP_KEY = b'coldview_source'
+
+
+def _source_stamp(path):
+    """
+    Identifies the workbook's current version by mtime and size (mtime alone misses
+    same-timestamp replacements, e.g. files extracted from a zip with 2s timestamps).
+    """
+    st = os.stat(path)
+    return f'{st.st_mtime_ns}:{st.st_size}'.encode()
+
+
+def _read_fresh_cache(path, stamp):
+    """
+    Returns the Parquet copy of path (<name>.xlsx.parquet) if it was written from the
+    workbook version identified by stamp, else None.
+    """
+    try:
+        import pyarrow.parquet as pq
+        metadata = pq.read_schema(path + '.parquet').metadata or {}
+        if metadata.get(_CACHE_STAMP_KEY) == stamp:
+            return pd.read_parquet(path + '.parquet')
+    except Exception:
+        pass  # No cache yet, no pyarrow, or unreadable cache - parse the workbook
+    return None
+
+
+def _parse_and_cache(path, stamp):
+    """
+    _load_one, then saves the result as <name>.xlsx.parquet stamped with the source version.
+    Module-level so worker processes can pickle it.
+    """
+    df = _load_one(path)
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.Table.from_pandas(df)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), _CACHE_STAMP_KEY: stamp})
+        pq.write_table(table, path + '.parquet', compression='zstd')
+    except Exception:
+        pass  # Caching is best-effort (read-only folder, no pyarrow, odd headers)
+    return df
+
+
+def _load_cached(path):
+    """
+    _load_one backed by a Parquet copy next to the workbook (<name>.xlsx.parquet).
+    The copy is only reused while the workbook's mtime and size match its stamp.
+    """
+    stamp = _source_stamp(path)
+    df = _read_fresh_cache(path, stamp)
+    return df if df is not None else _parse_and_cache(path, stamp)
+
+
+def _load_all(paths):
+    """
+    Reads every workbook like _load_cached. Fresh Parquet copies are read right here;
+    only cache misses are parsed, in worker processes when there is more than one
+    (zip inflate + XML parse is CPU-bound; one file isn't worth the worker start-up).
+    Returns [(path, df, error)] in input order - error is None unless that file failed.
+    """
+    loaded = {}
+    misses = []
+    for p in dict.fromkeys(paths):  # A file matching both piles is read once
+        try:
+            stamp = _source_stamp(p)
+            df = _read_fresh_cache(p, stamp)
+            if df is None:
+                misses.append((p, stamp))
+            else:
+                loaded[p] = (df, None)
+        except Exception as e:
+            loaded[p] = (None, e)
+
+    if len(misses) > 1:
+        with ProcessPoolExecutor(max_workers=min(len(misses), os.cpu_count() or 1)) as ex:
+            futures = [(p, ex.submit(_parse_and_cache, p, stamp)) for p, stamp in misses]
+        for p, fut in futures:
+            error = fut.exception()
+            loaded[p] = (None if error else fut.result(), error)
+    else:
+        for p, stamp in misses:
+            try:
+                loaded[p] = (_parse_and_cache(p, stamp), None)
+            except Exception as e:
+                loaded[p] = (None, e)
+
+    results = []
+    for p in paths:
+        df, error = loaded[p]
+        if any(p == r[0] for r in results) and df is not None:
+            df = df.copy()  # load_pile modifies its frames in place
+        results.append((p, df, error))
+    return results
+
+
+def _clean_amounts(amounts):
+    """
+    Parses amount strings like '$1,234.56' to float (unparseable -> 0.0).
+    Same result as dropping every char except digits, '.' and '-', but only values
+    that still hold other chars after the translate table go through the regex.
+    """
+    cleaned = amounts.astype(str).str.translate(_AMT_TBL)
+    leftover = cleaned.str.strip(_AMT_CHARS) != ''
+    if leftover.any():
+        cleaned.loc[leftover] = cleaned[leftover].str.replace(r'[^\d.-]', '', regex=True)
+    return pd.to_numeric(cleaned, errors='coerce').fillna(0.0)
+
+
+def _pair_breakdown(merged, key1, key2, count_col='Operation Number', amount_col='Amt_Float_DEBT'):
+    """
+    Equivalent of merged.groupby([key1, key2]).agg(count, sum) for the report views.
+    Factorizes both keys into one int code per row; counts via np.bincount, totals via
+    groupby on those codes (pandas' compensated sum - bincount's naive float sum drifts on money).
+    """
+    codes1, uniques1 = pd.factorize(merged[key1], sort=True)
+    codes2, uniques2 = pd.factorize(merged[key2], sort=True)
+    pair_codes, pairs = pd.factorize(codes1 * len(uniques2) + codes2, sort=True)
+
+    # count() semantics: rows with a missing count_col are not counted
+    counted = merged[count_col].notna().to_numpy()
+    counts = np.bincount(pair_codes[counted], minlength=len(pairs))
+    # Every code in 0..len(pairs)-1 occurs, so the sorted group order lines up with pairs
+    totals = pd.Series(merged[amount_col].to_numpy(dtype='float64')).groupby(pair_codes, sort=True).sum().to_numpy()
+
+    return pd.DataFrame({
+        key1: uniques1.take(pairs // len(uniques2)),
+        key2: uniques2.take(pairs % len(uniques2)),
+        'Count_Operations': counts,
+        'Total_Conciliated_Amount': totals,
+    })
+
 
 def robust_conciliation_duplicates_allowed():
     # --- CONFIGURATION ---
     folder_path = './accounting_files'
     
-    # Patterns
-    debt_pattern = '*m2d-recu*.xlsx'
-    credit_pattern = '*m6d-dev*.xlsx'
+    # Filename keywords (matched case-insensitively against *.xlsx files)
+    debt_keyword = 'm2d-recu'
+    credit_keyword = 'm6d-dev'
     
     # Headers
     col_card = 'Card'               
@@ -27,43 +230,36 @@ def robust_conciliation_duplicates_allowed():
         Converts filename to strict format: M2D-RECU <DATE> or M6D-DEV <DATE>
         """
         filename = os.path.basename(filepath)
-        name_lower = filename.lower()
-        
+
         # Regex to capture date (dots or dashes)
-        date_match = re.search(r'(\d+[\.-]\d+[\.-]\d+)', name_lower)
+        date_match = _DATE_RE.search(filename)
         date_str = date_match.group(1) if date_match else "NO_DATE"
-        
-        if 'm2d-recu' in name_lower:
+
+        if _M2D_RE.search(filename):
             return f"M2D-RECU {date_str}"
-        elif 'm6d-dev' in name_lower:
+        elif _M6D_RE.search(filename):
             return f"M6D-DEV {date_str}"
         else:
             return f"UNKNOWN {filename}"
 
     # --- 1. LOADER ---
-    def load_pile(pattern, label):
-        files = glob.glob(os.path.join(folder_path, pattern))
-        
-        # Double check filter (glob can be broad)
-        filter_keyword = 'm2d-recu' if label == "DEBT" else 'm6d-dev'
-        files = [f for f in files if filter_keyword in os.path.basename(f).lower()]
-        
+    def load_pile(loaded, label):
         all_dfs = []
         individual_files = {}  # Track individual files for duplicate detection
-        print(f"Loading {len(files)} files for {label}...")
+        print(f"Loading {len(loaded)} files for {label}...")
 
-        for f in files:
+        for f, df, load_error in loaded:
             try:
-                # Load as String to protect IDs from scientific notation
-                df = pd.read_excel(f, dtype=str)
+                if load_error is not None:
+                    raise load_error
                 
                 # Drop empty rows (trailing rows Excel includes beyond actual data)
                 # A valid row MUST have both Card and Operation Number
                 if col_card in df.columns and col_op in df.columns:
-                    # Replace empty strings/whitespace with NaN for proper dropna
-                    df[col_card] = df[col_card].replace(r'^\s*$', pd.NA, regex=True)
-                    df[col_op] = df[col_op].replace(r'^\s*$', pd.NA, regex=True)
-                    
+                    # Clean Keys: vectorized strip, then empty strings -> NaN for proper dropna
+                    df[col_card] = df[col_card].str.strip().replace('', pd.NA)
+                    df[col_op] = df[col_op].str.strip().replace('', pd.NA)
+
                     # Drop rows where BOTH key columns are empty (these are trailing rows)
                     rows_before = len(df)
                     df = df.dropna(subset=[col_card, col_op], how='all')
@@ -75,25 +271,21 @@ def robust_conciliation_duplicates_allowed():
                 std_name = get_standardized_name(f)
                 df['Accounting_Ref'] = std_name
                 
-                # Clean Keys
-                if col_card in df.columns and col_op in df.columns:
-                    df[col_card] = df[col_card].str.strip()
-                    df[col_op] = df[col_op].str.strip()
-                else:
+                # Keys were already stripped above
+                if col_card not in df.columns or col_op not in df.columns:
                     print(f"  [SKIP] {std_name} missing Card or Operation headers.")
                     continue
                 
                 # Clean Amount (Force to Float)
                 if col_amount in df.columns:
-                    clean_amt = df[col_amount].astype(str).str.replace(r'[^\d.-]', '', regex=True)
-                    df['Amt_Float'] = pd.to_numeric(clean_amt, errors='coerce').fillna(0.0)
+                    df['Amt_Float'] = _clean_amounts(df[col_amount])
                     all_dfs.append(df)
-                    individual_files[std_name] = df.copy()  # Store for comparison
+                    individual_files[std_name] = df  # Store for comparison (never mutated - no copy needed)
                 
             except Exception as e:
                 print(f"  [ERROR] {os.path.basename(f)}: {e}")
         
-        combined = pd.concat(all_dfs, ignore_index=True) if all_dfs else pd.DataFrame()
+        combined = pd.concat(all_dfs, ignore_index=True, sort=False) if all_dfs else pd.DataFrame()
         return combined, individual_files
 
     # --- INTRA-PILE DUPLICATE DETECTION ---
@@ -150,9 +342,12 @@ def robust_conciliation_duplicates_allowed():
         
         return issues
 
-    # Load Data
-    df_debt, debt_files = load_pile(debt_pattern, "DEBT")
-    df_credit, credit_files = load_pile(credit_pattern, "CREDIT")
+    # Load Data (both piles in one pass, so cache misses share a single worker pool)
+    debt_paths = _list_pile_files(folder_path, debt_keyword)
+    credit_paths = _list_pile_files(folder_path, credit_keyword)
+    loaded = _load_all(debt_paths + credit_paths)
+    df_debt, debt_files = load_pile(loaded[:len(debt_paths)], "DEBT")
+    df_credit, credit_files = load_pile(loaded[len(debt_paths):], "CREDIT")
 
     # Check for duplicates within each pile
     print("Checking for duplicate files within each category...")
@@ -364,6 +559,10 @@ def robust_conciliation_duplicates_allowed():
         print("No matches found.")
         return
 
+    # One distinct ref per source file - integer category codes make the breakdown keys cheap
+    for col in ('Accounting_Ref_DEBT', 'Accounting_Ref_CREDIT'):
+        merged[col] = merged[col].astype('category')
+
     # --- ORPHANED RECORDS ANALYSIS ---
     # BUSINESS RULE: All credits MUST match debts (can't have refund without original charge)
     # But debts without credits are okay (not all charges have been refunded yet)
@@ -432,27 +631,23 @@ def robust_conciliation_duplicates_allowed():
 
     # VIEW 1: DEBT FILE PERSPECTIVE
     # "Which Credit Files paid off this Debt File?"
-    debt_breakdown = merged.groupby(['Accounting_Ref_DEBT', 'Accounting_Ref_CREDIT']).agg(
-        Count_Operations=('Operation Number', 'count'),
-        Total_Conciliated_Amount=('Amt_Float_DEBT', 'sum') # Summing the Debt side is safe
-    ).reset_index()
+    # Summing the Debt side is safe
+    debt_breakdown = _pair_breakdown(merged, 'Accounting_Ref_DEBT', 'Accounting_Ref_CREDIT')
 
     # VIEW 2: CREDIT FILE PERSPECTIVE
     # "Which Debt Files did this Credit File cover?"
-    credit_breakdown = merged.groupby(['Accounting_Ref_CREDIT', 'Accounting_Ref_DEBT']).agg(
-        Count_Operations=('Operation Number', 'count'),
-        Total_Conciliated_Amount=('Amt_Float_DEBT', 'sum') # We still sum DEBT here.
-        # Why? Because 'Amt_Float_DEBT' represents the actual individual transactions covered.
-    ).reset_index()
+    # We still sum DEBT here.
+    # Why? Because 'Amt_Float_DEBT' represents the actual individual transactions covered.
+    credit_breakdown = _pair_breakdown(merged, 'Accounting_Ref_CREDIT', 'Accounting_Ref_DEBT')
 
     # --- 4. EXPORT ---
     try:
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            debt_breakdown.to_excel(writer, sheet_name='By_Debt_File', index=False)
-            credit_breakdown.to_excel(writer, sheet_name='By_Credit_File', index=False)
-            
+        with pd.ExcelWriter(output_file, engine='openpyxl', engine_kwargs={'write_only': True}) as writer:
+            _fast_to_excel(writer, debt_breakdown, 'By_Debt_File')
+            _fast_to_excel(writer, credit_breakdown, 'By_Credit_File')
+
             # Detailed Audit Sheet (Optional but recommended for tracing duplicates)
-            merged.to_excel(writer, sheet_name='Detailed_Audit_Log', index=False)
+            _fast_to_excel(writer, merged, 'Detailed_Audit_Log')
             
         print(f"SUCCESS. Report saved to: {output_file}")
         print("NOTE: 'Total_Conciliated_Amount' is calculated based on the sum of DEBT notes found.")
@@ -0,0 +1,156 @@
+"""
+Tests for watcher.py
+
+Tests cover:
+1. Network retry backoff (doubling, cap, reset on recovery)
+2. SMB port probe against local listening / closed ports
+3. Config loading cache (mtime invalidation)
+"""
+
+import unittest
+import json
+import os
+import shutil
+import socket
+import tempfile
+import time
+from unittest.mock import patch
+import sys
+
+# Import the module under test
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import watcher
+
+
+class TestWatcher(unittest.TestCase):
+    """Test suite for watcher.py retry, probe and config logic"""
+
+    def setUp(self):
+        """Reset module-level retry state and create local watch/dest folders"""
+        watcher.pending_retry = False
+        watcher._retry_backoff = watcher.RETRY_BACKOFF_MIN
+        watcher._next_retry_at = 0.0
+
+        self.test_dir = tempfile.mkdtemp()
+        self.watch_dir = os.path.join(self.test_dir, 'watch')
+        self.dest_dir = os.path.join(self.test_dir, 'dest')
+        os.makedirs(self.watch_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    # =========================================================================
+    # TEST 1: RETRY BACKOFF
+    # =========================================================================
+    def test_backoff_doubles_and_caps(self):
+        """Test that each deferred retry waits twice as long, capped at RETRY_BACKOFF_MAX"""
+        delays = []
+        for _ in range(12):
+            before = time.monotonic()
+            watcher.defer_retry()
+            delays.append(round(watcher._next_retry_at - before))
+
+        self.assertTrue(watcher.pending_retry)
+        self.assertEqual(delays, [1, 2, 4, 8, 16, 32, 64, 128, 256, 300, 300, 300])
+        self.assertEqual(watcher._retry_backoff, watcher.RETRY_BACKOFF_MAX)
+
+    def test_retry_due_only_after_delay(self):
+        """Test that a deferred retry is not due until its delay has passed"""
+        self.assertFalse(watcher.retry_due(), "No retry pending yet")
+
+        watcher.defer_retry()
+        self.assertFalse(watcher.retry_due())
+
+        with patch('watcher.time.monotonic', return_value=watcher._next_retry_at):
+            self.assertTrue(watcher.retry_due())
+
+    def test_unreachable_server_defers_retry(self):
+        """Test that check_and_process schedules a retry when the share is unreachable"""
+        config = watcher.Config(
+            watch_dir='\\\\server\\share', target_file='target.csv',
+            dest_dir=self.dest_dir, scheduled_times=['09:00']
+        )
+
+        with patch('watcher._probe_server', return_value=False):
+            self.assertFalse(watcher.check_and_process(config))
+            self.assertFalse(watcher.check_and_process(config))
+
+        self.assertTrue(watcher.pending_retry)
+        self.assertEqual(watcher._retry_backoff, 4)
+
+    def test_check_and_process_resets_backoff(self):
+        """Test that a check which reaches the share clears the retry and resets the backoff"""
+        for _ in range(6):
+            watcher.defer_retry()
+        self.assertGreater(watcher._retry_backoff, watcher.RETRY_BACKOFF_MIN)
+
+        with open(os.path.join(self.watch_dir, 'target.csv'), 'w') as f:
+            f.write('a,b\n1,2\n')
+        config = watcher.Config(
+            watch_dir=self.watch_dir, target_file='target.csv',
+            dest_dir=self.dest_dir, scheduled_times=['09:00']
+        )
+
+        self.assertTrue(watcher.check_and_process(config))
+        self.assertFalse(watcher.pending_retry)
+        self.assertEqual(watcher._retry_backoff, watcher.RETRY_BACKOFF_MIN)
+        self.assertFalse(os.path.exists(config.dest_path + '.tmp'), "Temporary copy should be renamed away")
+        with open(config.dest_path) as f:
+            self.assertEqual(f.read(), 'a,b\n1,2\n')
+
+    # =========================================================================
+    # TEST 2: SMB PORT PROBE
+    # =========================================================================
+    def test_probe_listening_port_is_reachable(self):
+        """Test that _probe_server succeeds against a listening localhost port"""
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            listener.bind(('127.0.0.1', 0))
+            listener.listen()
+            port = listener.getsockname()[1]
+
+            with patch('watcher.SMB_PORTS', (port,)):
+                self.assertTrue(watcher._probe_server('127.0.0.1', timeout=2))
+        finally:
+            listener.close()
+
+    def test_probe_closed_port_is_unreachable(self):
+        """Test that _probe_server fails (without waiting out the timeout) on a closed port"""
+        # Reserve a free port, then release it so nothing listens there
+        placeholder = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        placeholder.bind(('127.0.0.1', 0))
+        port = placeholder.getsockname()[1]
+        placeholder.close()
+
+        start = time.monotonic()
+        with patch('watcher.SMB_PORTS', (port,)):
+            self.assertFalse(watcher._probe_server('127.0.0.1', timeout=2))
+        self.assertLess(time.monotonic() - start, 2, "Refused connection should not wait for the timeout")
+
+    # =========================================================================
+    # TEST 3: CONFIG LOADING
+    # =========================================================================
+    def test_config_load_reuses_unchanged_file(self):
+        """Test that Config.load returns the cached Config until the file's mtime changes"""
+        path = os.path.join(self.test_dir, 'watcher_config.json')
+        with open(path, 'w') as f:
+            json.dump({'watch_dir': 'A', 'target_file': 'target.csv', 'dest_dir': 'B'}, f)
+
+        first = watcher.Config.load(path)
+        self.assertIs(watcher.Config.load(path), first)
+        self.assertEqual(first.scheduled_times, ['09:00'], "Defaults should apply")
+
+        with open(path, 'w') as f:
+            json.dump({'watch_dir': 'C', 'target_file': 'target.csv', 'dest_dir': 'B'}, f)
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        reloaded = watcher.Config.load(path)
+        self.assertIsNot(reloaded, first)
+        self.assertEqual(reloaded.watch_dir, 'C')
+
+
+if __name__ == '__main__':
+    # Run with verbose output
+    unittest.main(verbosity=2)
@@ -1,12 +1,17 @@
 import os
+import stat
 import shutil
 import logging
 import socket
+import selectors
+import errno
 import ctypes
+import signal
 import sys
 import time
 import json
 from dataclasses import dataclass
+from functools import cached_property
 from datetime import datetime
 
 try:
@@ -15,8 +20,49 @@ except ImportError:
     print("Missing dependency: schedule")
     sys.exit(1)
 
+# Optional: orjson parses the config faster; stdlib json otherwise
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 pending_retry = False
+# Retries of an unreachable server back off exponentially: 1s, 2s, 4s, ... capped at 5 minutes
+RETRY_BACKOFF_MIN = 1
+RETRY_BACKOFF_MAX = 300
+_retry_backoff = RETRY_BACKOFF_MIN
+_next_retry_at = 0.0
+
+SEP = "=" * 50
+
+SMB_PORTS = (445, 139)
+# connect_ex results meaning "connection underway" on a non-blocking socket
+_CONNECT_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY,
+                        getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK)}
+
+# Large files skip the system cache on Windows copies (avoids double-buffering over SMB)
+COPY_FILE_NO_BUFFERING = 0x00001000
+NO_BUFFERING_MIN_SIZE = 16 * 1024 * 1024
+
+# Win32 entry points bound once, with prototypes, instead of resolved through windll per call
+if os.name == 'nt':
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    _CopyFileExW = _kernel32.CopyFileExW
+    _CopyFileExW.argtypes = [ctypes.c_wchar_p, ctypes.c_wchar_p, ctypes.c_void_p,
+                             ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint32]
+    _CopyFileExW.restype = ctypes.c_int
+    _GetDriveTypeW = _kernel32.GetDriveTypeW
+    _GetDriveTypeW.argtypes = [ctypes.c_wchar_p]
+    _GetDriveTypeW.restype = ctypes.c_uint
+
+DRIVE_REMOTE = 4
+# Drive letter -> GetDriveTypeW result (a drive's type doesn't change while we run)
+_drive_type_cache: dict[str, int] = {}
+
+# Config file path -> (st_mtime_ns when parsed, Config)
+_config_cache: dict[str, tuple[int, "Config"]] = {}
 
 
 @dataclass
@@ -35,17 +81,40 @@ class Config:
     def dest_path(self) -> str:
         return os.path.join(self.dest_dir, self.target_file)
     
+    @cached_property
+    def is_network(self) -> bool:
+        # Whether watch_dir is remote doesn't change during a run - classify it once
+        return is_network_path(self.watch_dir)
+    
     @staticmethod
     def load(path: str) -> "Config":
-        with open(path, 'r') as f:
-            data = json.load(f)
-        return Config(
+        # Re-parse only when the file has changed since the last load
+        mtime = os.stat(path).st_mtime_ns
+        cached = _config_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with open(path, 'rb') as f:
+            data = _json_loads(f.read())
+        config = Config(
             watch_dir=data["watch_dir"],
             target_file=data["target_file"],
             dest_dir=data["dest_dir"],
             scheduled_times=data.get("scheduled_times", ["09:00"]),
             run_on_startup=data.get("run_on_startup", True)
         )
+        _config_cache[path] = (mtime, config)
+        return config
+
+
+class CachedTimeFormatter(logging.Formatter):
+    # datefmt has one-second resolution, so reuse the formatted time for records within the same second
+    _cached: tuple[int, str] = (-1, "")
+    
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        if self._cached[0] != second:
+            self._cached = (second, super().formatTime(record, datefmt))
+        return self._cached[1]
 
 
 def setup_logging() -> logging.Logger:
@@ -59,12 +128,12 @@ def setup_logging() -> logging.Logger:
     except (PermissionError, OSError):
         pass
     
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-        handlers=handlers
-    )
+    # One formatter shared by both handlers, so each record's time is formatted once
+    formatter = CachedTimeFormatter("%(asctime)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    logging.basicConfig(level=logging.INFO, handlers=handlers)
     return logging.getLogger(__name__)
 
 
@@ -73,43 +142,86 @@ logger = setup_logging()
 
 def is_network_path(path: str) -> bool:
     path = os.path.normpath(path)
-    if path.startswith("\\\\"):
+    if path[:2] == "\\\\":
         return True
     if os.name == 'nt' and len(path) >= 2 and path[1] == ':':
-        try:
-            return ctypes.windll.kernel32.GetDriveTypeW(path[0].upper() + ":\\") == 4
-        except Exception:
-            return False
+        drive = path[0].upper()
+        if drive not in _drive_type_cache:
+            try:
+                _drive_type_cache[drive] = _GetDriveTypeW(drive + ":\\")
+            except Exception:
+                return False
+        return _drive_type_cache[drive] == DRIVE_REMOTE
     return False
 
 
-def is_server_reachable(path: str) -> bool:
+def is_server_reachable(path: str, timeout: float = 5) -> bool:
     path = os.path.normpath(path)
     if not path.startswith("\\\\"):
         return True
     parts = path.split("\\")
     if len(parts) < 3:
         return True
-    server = parts[2]
+    return _probe_server(parts[2], timeout)
+
+
+def _probe_server(server: str, timeout: float) -> bool:
+    # Probe all SMB ports at once on non-blocking sockets - worst case is one timeout, not one per port
+    socks = []
     try:
-        socket.setdefaulttimeout(5)
-        for port in [445, 139]:
+        address = socket.gethostbyname(server)
+        pending = {}
+        for port in SMB_PORTS:
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            if sock.connect_ex((server, port)) == 0:
-                sock.close()
+            socks.append(sock)
+            sock.setblocking(False)
+            result = sock.connect_ex((address, port))
+            if result == 0:
+                logger.info("Server %s reachable on port %s", server, port)
                 return True
-            sock.close()
+            if result in _CONNECT_IN_PROGRESS:
+                pending[sock] = port
+        
+        # A finished connect (successful or not) shows up as writable; SO_ERROR tells which.
+        # selectors folds Windows' exception-set reporting of failed connects into EVENT_WRITE.
+        with selectors.DefaultSelector() as sel:
+            for sock, port in pending.items():
+                sel.register(sock, selectors.EVENT_WRITE, port)
+            deadline = time.monotonic() + timeout
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for key, _ in sel.select(remaining):
+                    sock = key.fileobj
+                    sel.unregister(sock)
+                    del pending[sock]
+                    if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                        logger.info("Server %s reachable on port %s", server, key.data)
+                        return True
         return False
     except socket.error:
         return False
     finally:
-        socket.setdefaulttimeout(None)
+        for sock in socks:
+            sock.close()
+
+
+def fast_copy(src: str, dst: str, size: int):
+    # Windows: let the OS copy engine stream the file (keeps timestamps/attributes like copy2)
+    if os.name == 'nt':
+        flags = COPY_FILE_NO_BUFFERING if size >= NO_BUFFERING_MIN_SIZE else 0
+        if _CopyFileExW(src, dst, None, None, None, flags):
+            return
+        logger.warning("CopyFileExW failed (%s) - falling back to copy2", ctypes.WinError(ctypes.get_last_error()))
+    # POSIX: copy2 already uses os.sendfile (in-kernel copy) on Linux
+    shutil.copy2(src, dst)
 
 
 def run_permission_test(config_file: str):
-    print("\n" + "=" * 50)
+    print("\n" + SEP)
     print("PERMISSION TEST")
-    print("=" * 50 + "\n")
+    print(SEP + "\n")
     
     all_passed = True
     
@@ -147,7 +259,7 @@ def run_permission_test(config_file: str):
             all_passed = False
     
     # Test 3: Watch directory - network check
-    if is_network_path(config.watch_dir):
+    if config.is_network:
         if is_server_reachable(config.watch_dir):
             print("✅ Network server: reachable")
         else:
@@ -184,105 +296,132 @@ def run_permission_test(config_file: str):
             all_passed = False
     
     # Summary
-    print("\n" + "=" * 50)
+    print("\n" + SEP)
     if all_passed:
         print("ALL TESTS PASSED ✅")
     else:
         print("SOME TESTS FAILED ❌")
-    print("=" * 50 + "\n")
+    print(SEP + "\n")
     
     return all_passed
 
 
-def check_and_process(config: Config) -> bool:
-    global pending_retry
+def defer_retry():
+    global pending_retry, _retry_backoff, _next_retry_at
+    pending_retry = True
+    _next_retry_at = time.monotonic() + _retry_backoff
+    _retry_backoff = min(_retry_backoff * 2, RETRY_BACKOFF_MAX)
+
+
+def retry_due() -> bool:
+    return pending_retry and time.monotonic() >= _next_retry_at
+
+
+def check_and_process(config: Config, skip_network_check: bool = False) -> bool:
+    global pending_retry, _retry_backoff
     
-    logger.info("=" * 50)
-    logger.info(f"CHECK @ {datetime.now().strftime('%H:%M:%S')}")
-    logger.info("=" * 50)
+    logger.info(SEP)
+    logger.info("CHECK @ %s", datetime.now().strftime('%H:%M:%S'))
+    logger.info(SEP)
     
-    # Check network path
-    if is_network_path(config.watch_dir) and not is_server_reachable(config.watch_dir):
-        logger.error(f"Server unreachable: {config.watch_dir}")
+    # Check network path (callers that have just probed the server pass skip_network_check)
+    if (not skip_network_check and config.is_network
+            and not is_server_reachable(config.watch_dir)):
+        logger.error("Server unreachable: %s", config.watch_dir)
         logger.info("Will retry when network becomes available")
-        pending_retry = True
+        defer_retry()
         return False
     
     # Network is available - clear retry flag if it was set
     if pending_retry:
         logger.info("Network recovered - processing pending retry")
         pending_retry = False
+        _retry_backoff = RETRY_BACKOFF_MIN
     
     # Check watch directory
     if not os.path.exists(config.watch_dir):
-        logger.error(f"Watch directory not found: {config.watch_dir}")
+        logger.error("Watch directory not found: %s", config.watch_dir)
         return False
     
     if not os.access(config.watch_dir, os.R_OK):
-        logger.error(f"No read access: {config.watch_dir}")
+        logger.error("No read access: %s", config.watch_dir)
         return False
     
-    logger.info(f"Watch directory OK: {config.watch_dir}")
+    logger.info("Watch directory OK: %s", config.watch_dir)
     
-    # Check if file exists
-    if not os.path.isfile(config.target_path):
-        logger.info(f"File not found: {config.target_file}")
-        contents = os.listdir(config.watch_dir)[:10]
-        if contents:
-            logger.info(f"Directory contents: {contents}")
+    # Check if file exists - one stat gives both the type and the size
+    try:
+        st = os.stat(config.target_path)
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        logger.info("File not found: %s", config.target_file)
+        # Diagnostic only - skip the listing entirely when INFO is filtered out
+        if logger.isEnabledFor(logging.INFO):
+            # scandir fetches entries lazily, so stopping at 10 avoids listing a large share in full
+            contents = []
+            with os.scandir(config.watch_dir) as it:
+                for entry in it:
+                    contents.append(entry.name)
+                    if len(contents) == 10:
+                        break
+            if contents:
+                logger.info("Directory contents: %s", contents)
         return False
     
-    size = os.path.getsize(config.target_path)
-    logger.info(f"Found: {config.target_file} ({size} bytes)")
+    size = st.st_size
+    logger.info("Found: %s (%s bytes)", config.target_file, size)
     
     # Ensure destination exists
     if not os.path.exists(config.dest_dir):
         try:
             os.makedirs(config.dest_dir, exist_ok=True)
-            logger.info(f"Created: {config.dest_dir}")
+            logger.info("Created: %s", config.dest_dir)
         except OSError as e:
-            logger.error(f"Cannot create destination: {e}")
+            logger.error("Cannot create destination: %s", e)
             return False
     
     if not os.access(config.dest_dir, os.W_OK):
-        logger.error(f"No write access: {config.dest_dir}")
+        logger.error("No write access: %s", config.dest_dir)
         return False
     
-    # Copy file
+    # Copy file - into a temporary sibling, then swap it in so readers never see a partial copy
+    tmp_path = config.dest_path + ".tmp"
     try:
-        if os.path.exists(config.dest_path):
-            os.remove(config.dest_path)
-        
-        shutil.copy2(config.target_path, config.dest_path)
-        
-        if os.path.exists(config.dest_path):
-            logger.info(f"Copied to: {config.dest_path}")
-            logger.info("SUCCESS!")
-            return True
-        
-        logger.error("Copy verification failed")
-        return False
+        fast_copy(config.target_path, tmp_path, size)
+        os.replace(tmp_path, config.dest_path)
+        logger.info("Copied to: %s", config.dest_path)
+        logger.info("SUCCESS!")
+        return True
     except Exception as e:
-        logger.error(f"Copy failed: {e}")
+        logger.error("Copy failed: %s", e)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
         return False
 
 
 def run_with_network_retry(config: Config):
-    global pending_retry
-    
-    # If network is available and there's a pending retry, run it
-    if pending_retry and is_network_path(config.watch_dir):
+    # If a retry is due and the network is back, run it
+    if retry_due() and config.is_network:
         if is_server_reachable(config.watch_dir):
             logger.info("Network back online - running pending check")
-            check_and_process(config)
+            check_and_process(config, skip_network_check=True)
             return
+        defer_retry()
     
     # Run scheduled jobs
     schedule.run_pending()
 
 
+def request_stop(signum, frame):
+    # A service stop (SIGTERM) ends the scheduler loop the same way Ctrl+C does,
+    # interrupting its sleep immediately
+    raise KeyboardInterrupt
+
+
 def main():
-    global pending_retry
     config_file = os.path.join(os.path.dirname(__file__), "watcher_config.json")
     
     # Handle --test flag (permission check only)
@@ -300,23 +439,23 @@ def main():
         sys.exit(0 if success else 1)
     
     if not os.path.exists(config_file):
-        logger.error(f"Config file not found: {config_file}")
+        logger.error("Config file not found: %s", config_file)
         sys.exit(1)
     
     config = Config.load(config_file)
     
-    logger.info("=" * 50)
+    logger.info(SEP)
     logger.info("FILE WATCHER STARTED")
-    logger.info(f"Watch: {config.watch_dir}")
-    logger.info(f"Target: {config.target_file}")
-    logger.info(f"Dest: {config.dest_dir}")
-    logger.info(f"Schedule: {config.scheduled_times}")
-    logger.info("=" * 50)
+    logger.info("Watch: %s", config.watch_dir)
+    logger.info("Target: %s", config.target_file)
+    logger.info("Dest: %s", config.dest_dir)
+    logger.info("Schedule: %s", config.scheduled_times)
+    logger.info(SEP)
     
     # Setup schedule
     for time_str in config.scheduled_times:
-        schedule.every().day.at(time_str).do(lambda: check_and_process(config))
-        logger.info(f"Scheduled: {time_str}")
+        schedule.every().day.at(time_str).do(check_and_process, config)
+        logger.info("Scheduled: %s", time_str)
     
     # Run on startup if configured
     if config.run_on_startup:
@@ -324,15 +463,26 @@ def main():
     
     # Run scheduler loop with network retry support
     logger.info("Scheduler running (Ctrl+C to stop)")
+    signal.signal(signal.SIGTERM, request_stop)
     try:
         while True:
-            if pending_retry and is_network_path(config.watch_dir):
+            if retry_due() and config.is_network:
                 if is_server_reachable(config.watch_dir):
                     logger.info("Network recovered - running pending check")
-                    check_and_process(config)
+                    check_and_process(config, skip_network_check=True)
+                else:
+                    defer_retry()
             
             schedule.run_pending()
-            time.sleep(60)
+            
+            # Sleep until the next job is due, or the next retry if one is pending
+            idle = schedule.idle_seconds()
+            if idle is None:
+                idle = 60
+            wait = min(idle, 300)
+            if pending_retry:
+                wait = min(wait, _next_retry_at - time.monotonic())
+            time.sleep(max(1, wait))
     except KeyboardInterrupt:
         logger.info("Stopped")
 